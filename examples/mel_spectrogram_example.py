@@ -15,9 +15,12 @@ def generate_test_signal(duration=1.0, sr=22050):
     """
     import numpy as np
     t = np.linspace(0, duration, int(sr * duration), endpoint=False)
-    signal = (np.sin(2 * np.pi * 440 * t) +  # 440 Hz (A4音)
-             0.5 * np.sin(2 * np.pi * 880 * t) +  # 880 Hz (A5音)
-             0.25 * np.sin(2 * np.pi * 1760 * t))  # 1760 Hz (A6音)
+    freqs = np.array([440, 880, 1760])  # A4、A5、A6音
+    amps = np.array([1.0, 0.5, 0.25])
+    # 一次計算所有頻率成分的正弦值，再以矩陣向量乘法加權相加
+    sines = np.outer(2 * np.pi * freqs, t)
+    np.sin(sines, out=sines)
+    signal = amps @ sines
     
     return signal, sr
 
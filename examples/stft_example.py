@@ -18,9 +18,12 @@ def generate_test_signal(duration=1.0, sample_rate=44100):
     """
     t = np.linspace(0, duration, int(sample_rate * duration))
     # 生成一個包含多個頻率的信號
-    signal = (np.sin(2 * np.pi * 440 * t) +  # A4 音 (440 Hz)
-              0.5 * np.sin(2 * np.pi * 880 * t) +  # A5 音 (880 Hz)
-              0.3 * np.sin(2 * np.pi * 1760 * t))  # A6 音 (1760 Hz)
+    freqs = np.array([440, 880, 1760])  # A4、A5、A6 音
+    amps = np.array([1.0, 0.5, 0.3])
+    # 一次計算所有頻率成分的正弦值，再以矩陣向量乘法加權相加
+    sines = np.outer(2 * np.pi * freqs, t)
+    np.sin(sines, out=sines)
+    signal = amps @ sines
     
     return signal, sample_rate
 
@@ -49,7 +52,8 @@ def main():
     print("STFT 轉換完成")
     
     # 繪製時頻譜圖
-    spectrogram_path = plotter.plot_spectrogram(stft_matrix, sample_rate, processor.hop_length)
+    spectrogram_path = plotter.plot_spectrogram(stft_matrix, sample_rate, processor.hop_length,
+                                                 n_fft=processor.window_size)
     print(f"時頻譜圖已儲存為: {spectrogram_path}")
     
     # 執行 iSTFT
@@ -82,15 +86,8 @@ def update_report(spectrogram_path, data_path, snr):
     """
     report_path = "REPORT.md"
     
-    if not os.path.exists(report_path):
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write("# 音訊處理實驗報告\n\n")
-    
-    try:
-        with open(report_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-    except FileNotFoundError:
-        content = "# 音訊處理實驗報告\n\n"
+    # 僅在報告檔案不存在或為空時寫入標題
+    write_header = not os.path.exists(report_path) or os.path.getsize(report_path) == 0
     
     import datetime
     new_entry = f"""
@@ -110,8 +107,11 @@ def update_report(spectrogram_path, data_path, snr):
 ---
 """
     
-    with open(report_path, 'w', encoding='utf-8') as f:
-        f.write(content + new_entry)
+    # 以附加模式只寫入新條目，不需讀取並重寫整份報告
+    with open(report_path, 'a', encoding='utf-8') as f:
+        if write_header:
+            f.write("# 音訊處理實驗報告\n\n")
+        f.write(new_entry)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -7,6 +7,12 @@ import datetime
 import os
 import json
 
+try:
+    # orjson 為選用套件，可直接序列化 numpy 數組且速度遠快於 json 模組
+    import orjson
+except ImportError:
+    orjson = None
+
 # 用於自動生成實驗數據的全局變數
 EXPERIMENT_ID = 1
 EXPERIMENT_DATE = datetime.datetime.now().strftime("%Y%m%d")
@@ -26,9 +32,12 @@ def generate_signal(freq=5, duration=1, sampling_rate=1000):
     """
     t = np.linspace(0, duration, int(sampling_rate * duration), endpoint=False)
     # 生成包含多個頻率成分的信號
-    signal = (np.sin(2 * np.pi * freq * t) + 
-              0.5 * np.sin(2 * np.pi * 2 * freq * t) + 
-              0.25 * np.sin(2 * np.pi * 3 * freq * t))
+    freqs = np.array([freq, 2 * freq, 3 * freq])
+    amps = np.array([1.0, 0.5, 0.25])
+    # 一次計算所有頻率成分的正弦值，再以矩陣向量乘法加權相加
+    sines = np.outer(2 * np.pi * freqs, t)
+    np.sin(sines, out=sines)
+    signal = amps @ sines
     
     return t, signal, [freq, 2*freq, 3*freq]
 
@@ -43,16 +52,18 @@ def perform_fft(signal, sampling_rate):
         tuple: 包含頻率向量和對應幅值的元組。
     """
     n = len(signal)
-    # 執行FFT
-    fft_result = np.fft.fft(signal)
+    # 實數信號只需計算非負頻率部分
+    fft_result = np.fft.rfft(signal)
     # 計算頻率向量
-    freq = np.fft.fftfreq(n, 1/sampling_rate)
-    # 計算正規化的幅值譜
-    magnitude = np.abs(fft_result) / n * 2
+    freq = np.fft.rfftfreq(n, 1/sampling_rate)
+    # 計算正規化的單邊幅值譜
+    magnitude = np.abs(fft_result) * (2.0 / n)
+    # 直流與Nyquist頻率沒有對應的負頻率，不需加倍
+    magnitude[0] /= 2
+    if n % 2 == 0:
+        magnitude[-1] /= 2
     
-    # 只返回正半部分頻率
-    positive_freq_mask = freq >= 0
-    return freq[positive_freq_mask], magnitude[positive_freq_mask]
+    return freq, magnitude
 
 def perform_ifft(fft_result):
     """執行逆快速傅立葉變換(iFFT)。
@@ -91,7 +102,9 @@ def plot_results(t, original_signal, reconstructed_signal, freq, magnitude, targ
     ax1.grid(True)
     
     # 繪製頻譜 - 修正 stem 函數參數
-    ax2.stem(freq, magnitude)  # 移除 use_line_collection 參數
+    # vlines 以單一 LineCollection 繪製所有頻率點，避免 stem 在長頻譜上的繪圖開銷
+    ax2.vlines(freq, 0, magnitude, linewidth=0.5)
+    ax2.plot(freq, magnitude, 'o', markersize=2)
     ax2.set_title('FFT 頻譜 (FFT Spectrum)')
     ax2.set_xlabel('頻率 (Hz)')
     ax2.set_ylabel('幅值')
@@ -146,17 +159,21 @@ def save_data(t, original_signal, reconstructed_signal, freq, magnitude, target_
         "experiment_id": EXPERIMENT_ID,
         "date": EXPERIMENT_DATE,
         "target_frequencies": target_freqs,
-        "time_series": t.tolist(),
-        "original_signal": original_signal.tolist(),
-        "reconstructed_signal": reconstructed_signal.tolist(),
-        "fft_frequencies": freq.tolist(),
-        "fft_magnitude": magnitude.tolist()
+        "time_series": np.ascontiguousarray(t),
+        "original_signal": np.ascontiguousarray(original_signal),
+        "reconstructed_signal": np.ascontiguousarray(reconstructed_signal),
+        "fft_frequencies": np.ascontiguousarray(freq),
+        "fft_magnitude": np.ascontiguousarray(magnitude)
     }
     
     # 保存為JSON，檔名包含實驗ID和日期
     filename = f'FFT_Data_Exp{EXPERIMENT_ID}_{EXPERIMENT_DATE}_save_data.json'
-    with open(filename, 'w') as f:
-        json.dump(data, f, indent=4)
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2))
+    else:
+        with open(filename, 'w') as f:
+            json.dump(data, f, indent=4, default=lambda obj: obj.tolist())
     
     return filename
 
@@ -8,6 +8,12 @@ import datetime
 import json
 import os
 
+try:
+    # orjson 為選用套件，可直接序列化 numpy 數組且速度遠快於 json 模組
+    import orjson
+except ImportError:
+    orjson = None
+
 class MelSpectrogramAnalyzer:
     """梅爾頻譜分析器類別。
 
@@ -105,12 +111,16 @@ class MelSpectrogramAnalyzer:
             "fmin": self.fmin,
             "fmax": self.fmax,
             "sampling_rate": sr,
-            "mel_spectrogram": mel_spectrogram.tolist()
+            "mel_spectrogram": np.ascontiguousarray(mel_spectrogram)
         }
         
         filename = f'Mel_Data_Exp{self.experiment_id}_{self.date}.json'
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=4)
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(data, f, indent=4, default=lambda obj: obj.tolist())
         
         return filename
 
@@ -170,9 +180,12 @@ def generate_test_signal(duration=1.0, sr=22050):
     """
     # 生成一個包含多個頻率成分的測試信號
     t = np.linspace(0, duration, int(sr * duration), endpoint=False)
-    signal = (np.sin(2 * np.pi * 440 * t) +  # 440 Hz (A4音)
-             0.5 * np.sin(2 * np.pi * 880 * t) +  # 880 Hz (A5音)
-             0.25 * np.sin(2 * np.pi * 1760 * t))  # 1760 Hz (A6音)
+    freqs = np.array([440, 880, 1760])  # A4、A5、A6音
+    amps = np.array([1.0, 0.5, 0.25])
+    # 一次計算所有頻率成分的正弦值，再以矩陣向量乘法加權相加
+    sines = np.outer(2 * np.pi * freqs, t)
+    np.sin(sines, out=sines)
+    signal = amps @ sines
     
     return signal, sr
 
@@ -30,4 +30,9 @@ setup(
         'librosa>=0.10.1',
         'scipy>=1.10.0'
     ],
+    extras_require={
+        'numba': ['numba>=0.57.0', 'rocket-fft>=0.2.0'],
+        'orjson': ['orjson>=3.0.0'],
+        'fftw': ['pyFFTW>=0.13.0'],
+    },
 )
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""JSON 寫入工具。
+
+若已安裝選用相依套件 orjson，使用其 C 實作的編碼器並直接序列化 numpy
+數組與純量；否則退回標準函式庫的 json 模組，numpy 數據以 ``tolist()`` 轉換。
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _to_builtin(obj):
+    """將 numpy 數組與純量轉換為 json 模組可序列化的 Python 物件。"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dump_json(data, filename):
+    """將數據寫入 JSON 檔案。
+
+    Args:
+        data (dict): 要保存的數據。
+        filename (str): 要保存的檔案路徑。
+    """
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2))
+    else:
+        with open(filename, 'w') as f:
+            json.dump(data, f, indent=4, default=_to_builtin)
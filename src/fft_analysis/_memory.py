@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""記憶體配置工具。
+
+提供位址對齊的數組配置，供 FFT 與 STFT 的暫存緩衝區使用。
+"""
+
+import numpy as np
+
+
+def _aligned_empty(shape, dtype, alignment=64):
+    """配置起始位址對齊到指定位元組數的未初始化數組。
+
+    NumPy 預設配置器只保證 16 位元組對齊；AVX2/AVX-512 的對齊載入需要
+    32/64 位元組對齊。
+
+    Args:
+        shape (int or tuple): 數組形狀。
+        dtype (numpy.dtype): 數據類型。
+        alignment (int, optional): 對齊的位元組數。預設為64。
+
+    Returns:
+        numpy.ndarray: 對齊的連續數組。
+    """
+    dtype = np.dtype(dtype)
+    shape = (shape,) if np.isscalar(shape) else tuple(shape)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    buffer = np.empty(nbytes + alignment, dtype=np.uint8)
+    offset = -buffer.ctypes.data % alignment
+    return buffer[offset:offset + nbytes].view(dtype).reshape(shape)
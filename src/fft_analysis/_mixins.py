@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""分析器共用的混入類別：延遲取得的實驗日期與重複使用的繪圖物件。"""
+
+import datetime
+
+
+class DateMixin:
+    """提供延遲取得的實驗日期屬性。
+
+    使用此類別者需在 ``__init__`` 中設定 ``self._date = None``；日期在第一次
+    存取 ``date`` 時才取得，未使用的分析器不需呼叫 ``datetime.now()``。
+    """
+
+    @property
+    def date(self):
+        """str: 實驗日期（YYYYMMDD格式）。"""
+        if self._date is None:
+            self._date = datetime.datetime.now().strftime("%Y%m%d")
+        return self._date
+
+    @date.setter
+    def date(self, value):
+        self._date = value
+
+
+class FigureMixin:
+    """提供跨次繪圖重複使用的 matplotlib 圖形物件。
+
+    使用此類別者需在 ``__init__`` 中設定 ``self._figure = None``。
+    """
+
+    def _get_figure(self):
+        """取得重複使用的圖形物件，避免每次繪圖都重新建立與關閉 Figure。
+
+        Returns:
+            matplotlib.figure.Figure: 已清空的圖形物件。
+        """
+        if self._figure is None:
+            # 延遲匯入 matplotlib，未繪圖時不需負擔其載入時間
+            from matplotlib.figure import Figure
+            self._figure = Figure(figsize=(12, 8))
+        else:
+            self._figure.clf()
+        return self._figure
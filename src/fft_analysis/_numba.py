@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Numba 相容層。
+
+Numba 與 Rocket-FFT 為選用相依套件。未安裝時 ``njit`` 會退化為不做任何事的
+裝飾器、``prange`` 退化為 ``range``，呼叫端應依 ``NUMBA_AVAILABLE`` 與
+``ROCKET_FFT_AVAILABLE`` 決定是否使用 JIT 編譯的核心函數。
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Numba 未安裝時的替代裝飾器，直接返回原函數。"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+try:
+    # Rocket-FFT 讓 numpy.fft 可以在 njit 函數中使用
+    import rocket_fft  # noqa: F401
+    ROCKET_FFT_AVAILABLE = NUMBA_AVAILABLE
+except ImportError:
+    ROCKET_FFT_AVAILABLE = False
+
+__all__ = ['njit', 'prange', 'NUMBA_AVAILABLE', 'ROCKET_FFT_AVAILABLE']
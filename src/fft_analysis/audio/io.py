@@ -11,11 +11,17 @@ class AudioLoader:
 
     Attributes:
         supported_formats (list): 支援的音訊格式列表。
+        chunk_size (int): 分塊寫入長音訊時每塊的採樣點數。
     """
 
-    def __init__(self):
-        """初始化音訊讀寫器。"""
+    def __init__(self, chunk_size=1 << 20):
+        """初始化音訊讀寫器。
+
+        Args:
+            chunk_size (int, optional): 分塊寫入長音訊時每塊的採樣點數。預設為1048576。
+        """
         self.supported_formats = ['.wav', '.flac', '.ogg']
+        self.chunk_size = chunk_size
 
     def load_audio(self, file_path):
         """讀取音訊檔案。
@@ -42,13 +48,17 @@ class AudioLoader:
         
         return audio_data, sample_rate
 
-    def save_audio(self, file_path, audio_data, sample_rate):
+    def save_audio(self, file_path, audio_data, sample_rate, inplace=False):
         """保存音訊檔案。
 
+        長音訊會分塊裁剪並寫入，避免在記憶體中同時保存整段信號的複本。
+
         Args:
             file_path (str): 要保存的檔案路徑。
             audio_data (numpy.ndarray): 音訊數據。
             sample_rate (int): 取樣率。
+            inplace (bool, optional): 是否直接在 ``audio_data`` 上裁剪到 [-1, 1]
+                範圍（會修改輸入數組）。預設為False。
 
         Raises:
             ValueError: 當檔案格式不支援時。
@@ -57,8 +67,24 @@ class AudioLoader:
         if not any(file_path.lower().endswith(fmt) for fmt in self.supported_formats):
             raise ValueError(f"Unsupported audio format. Supported formats: {self.supported_formats}")
         
-        # 正規化音訊數據到 [-1, 1] 範圍
-        audio_data = np.clip(audio_data, -1, 1)
+        if inplace:
+            # 正規化音訊數據到 [-1, 1] 範圍（原地修改）
+            np.clip(audio_data, -1, 1, out=audio_data)
+            sf.write(file_path, audio_data, sample_rate)
+            return
+        
+        audio_data = np.asarray(audio_data)
+        if len(audio_data) <= self.chunk_size:
+            # 正規化音訊數據到 [-1, 1] 範圍
+            sf.write(file_path, np.clip(audio_data, -1, 1), sample_rate)
+            return
         
-        # 保存音訊檔案
-        sf.write(file_path, audio_data, sample_rate)
\ No newline at end of file
+        # 分塊正規化並寫入，重複使用同一個暫存緩衝區
+        channels = 1 if audio_data.ndim == 1 else audio_data.shape[1]
+        scratch = np.empty((self.chunk_size,) + audio_data.shape[1:], dtype=audio_data.dtype)
+        with sf.SoundFile(file_path, mode='w', samplerate=sample_rate, channels=channels) as f:
+            for start in range(0, len(audio_data), self.chunk_size):
+                chunk = audio_data[start:start + self.chunk_size]
+                clipped = scratch[:len(chunk)]
+                np.clip(chunk, -1, 1, out=clipped)
+                f.write(clipped)
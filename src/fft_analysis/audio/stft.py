@@ -2,24 +2,73 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
+import scipy.fft
 import scipy.signal as signal
-import datetime
-import json
+import os
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
-class STFTProcessor:
+from .._json import dump_json
+from .._memory import _aligned_empty
+from .._mixins import DateMixin
+from .._numba import njit, prange, ROCKET_FFT_AVAILABLE
+
+# GPU 後端只在幀數達到此值時使用；較短的信號傳輸成本高於計算收益
+GPU_MIN_FRAMES = 1024
+
+# 每個處理器最多快取的重疊相加權重數（每份權重與輸出信號等長）
+NORM_CACHE_SIZE = 8
+
+
+@njit(parallel=True, cache=True)
+def _stft_core(audio_signal, window, hop_length, num_frames):
+    """以 Numba 平行計算所有幀的實數 FFT（需要 Rocket-FFT）。"""
+    window_size = window.shape[0]
+    spectra = np.empty((num_frames, window_size // 2 + 1), dtype=np.complex128)
+    for i in prange(num_frames):
+        start = i * hop_length
+        spectra[i, :] = np.fft.rfft(audio_signal[start:start + window_size] * window)
+    return spectra.T
+
+
+@njit(parallel=True, cache=True)
+def _istft_core(spectra, window, hop_length, norm):
+    """以 Numba 平行計算所有幀的實數 iFFT 並重疊相加（需要 Rocket-FFT）。"""
+    num_frames = spectra.shape[0]
+    window_size = window.shape[0]
+    frames = np.empty((num_frames, window_size))
+    for i in prange(num_frames):
+        frames[i, :] = np.fft.irfft(spectra[i], window_size) * window
+    
+    # 重疊相加會寫入相同位置，因此依序執行
+    output_signal = np.zeros(norm.shape[0])
+    for i in range(num_frames):
+        start = i * hop_length
+        output_signal[start:start + window_size] += frames[i]
+    return output_signal / norm
+
+
+class STFTProcessor(DateMixin):
     """短時傅立葉轉換處理器。
 
     此類提供音訊信號的 STFT 和 iSTFT 功能，支援多種視窗函數和參數設定。
+    預設以單精度（``float32``）計算：音訊的動態範圍遠小於 ``float32`` 的
+    24 位元尾數精度，單精度可使搬移的資料量減半並加倍 SIMD 吞吐量。
 
     Attributes:
         window_size (int): 視窗大小（採樣點數）。
         hop_length (int): 視窗移動步長。
         window_type (str): 視窗函數類型。
+        dtype (numpy.dtype): 計算使用的實數精度。
+        backend (str): 計算後端（'scipy'、'numpy'、'numba'、'cupy' 或 'torch'）。
+        workers (int): FFT 使用的執行緒數量。
         experiment_id (int): 實驗編號。
         date (str): 實驗日期（YYYYMMDD格式）。
     """
 
-    def __init__(self, window_size=2048, hop_length=512, window_type='hann', experiment_id=1):
+    def __init__(self, window_size=2048, hop_length=512, window_type='hann', experiment_id=1,
+                 dtype=np.float32, backend='scipy', workers=-1):
         """初始化 STFT 處理器。
 
         Args:
@@ -27,15 +76,39 @@ class STFTProcessor:
             hop_length (int, optional): 視窗移動步長。預設為512。
             window_type (str, optional): 視窗函數類型。預設為'hann'。
             experiment_id (int, optional): 實驗編號。預設為1。
+            dtype (numpy.dtype, optional): 計算使用的實數精度。預設為numpy.float32。
+            backend (str, optional): 計算後端。'scipy' 使用支援多執行緒的
+                scipy.fft，'numba' 需要安裝 numba 與 rocket-fft，'cupy' 與 'torch'
+                在 CUDA GPU 上執行批次 FFT（無可用 GPU 時退回 'scipy'）。
+                預設為'scipy'。
+            workers (int, optional): FFT 使用的執行緒數量，負數表示依 scipy.fft 的
+                慣例從 CPU 核心數倒數（-1 為所有核心）。預設為-1。
+
+        Raises:
+            ValueError: 當指定的計算後端不支援或 ``workers`` 為0時。
+            ImportError: 當計算後端所需的套件未安裝時。
         """
+        # 依 scipy.fft 的慣例 workers 不可為0，所有後端一致檢查
+        if workers == 0:
+            raise ValueError("Unsupported workers value: 0, workers must not be zero")
+        
         self.window_size = window_size
         self.hop_length = hop_length
         self.window_type = window_type
         self.experiment_id = experiment_id
-        self.date = datetime.datetime.now().strftime("%Y%m%d")
+        self.dtype = np.dtype(dtype)
+        self.backend = backend
+        self.workers = workers
+        self._date = None
+        
+        self._check_backend()
         
-        # 創建視窗函數
+        # 創建視窗函數（只轉換一次精度）
         self.window = self._get_window()
+        
+        # 預先計算 iSTFT 的重疊相加權重模板；完整權重以幀數為鍵，只快取最近使用的幾份
+        self._build_norm_templates()
+        self._norm_cache = OrderedDict()
 
     def _get_window(self):
         """獲取指定類型的視窗函數。
@@ -50,73 +123,384 @@ class STFTProcessor:
         if self.window_type not in supported_windows:
             raise ValueError(f"Unsupported window type. Supported types: {supported_windows}")
         
-        return signal.get_window(self.window_type, self.window_size)
+        window = _aligned_empty(self.window_size, self.dtype)
+        window[:] = signal.get_window(self.window_type, self.window_size)
+        return window
+
+    def _check_backend(self):
+        """檢查計算後端是否支援且可用。
+
+        Raises:
+            ValueError: 當指定的計算後端不支援時。
+            ImportError: 當計算後端所需的套件未安裝時。
+        """
+        supported_backends = ['scipy', 'numpy', 'numba', 'cupy', 'torch']
+        if self.backend not in supported_backends:
+            raise ValueError(f"Unsupported backend. Supported backends: {supported_backends}")
+        
+        if self.backend == 'numba' and not ROCKET_FFT_AVAILABLE:
+            raise ImportError("The 'numba' backend requires numba and rocket-fft to be installed")
+        
+        self._gpu_available = self.backend in ('cupy', 'torch') and self._check_gpu()
+        if self.backend in ('cupy', 'torch') and not self._gpu_available:
+            warnings.warn(f"No CUDA device available for the '{self.backend}' backend; "
+                          f"falling back to 'scipy'")
+
+    def _check_gpu(self):
+        """檢查 GPU 後端的套件與 CUDA 裝置是否可用。
+
+        Returns:
+            bool: GPU 後端是否可用。
+        """
+        try:
+            if self.backend == 'cupy':
+                import cupy
+                return cupy.cuda.runtime.getDeviceCount() > 0
+            import torch
+            return torch.cuda.is_available()
+        except (ImportError, RuntimeError):
+            return False
+
+    def _use_gpu(self, num_frames):
+        """判斷此次轉換是否在 GPU 上執行。
+
+        Args:
+            num_frames (int): 幀數。
+
+        Returns:
+            bool: 是否使用 GPU。
+        """
+        return self._gpu_available and num_frames >= GPU_MIN_FRAMES
+
+    def _gpu_rfft(self, frames):
+        """上傳加窗幀，在 GPU 上執行批次實數 FFT 後下載結果。"""
+        if self.backend == 'cupy':
+            import cupy
+            return cupy.asnumpy(cupy.fft.rfft(cupy.asarray(frames), axis=1))
+        import torch
+        return torch.fft.rfft(torch.from_numpy(frames).cuda(), dim=1).cpu().numpy()
+
+    def _gpu_irfft(self, spectra):
+        """上傳頻譜，在 GPU 上執行批次實數 iFFT 後下載結果。"""
+        if self.backend == 'cupy':
+            import cupy
+            return cupy.asnumpy(cupy.fft.irfft(cupy.asarray(spectra), n=self.window_size, axis=1))
+        import torch
+        spectra = torch.from_numpy(np.ascontiguousarray(spectra)).cuda()
+        return torch.fft.irfft(spectra, n=self.window_size, dim=1).cpu().numpy()
+
+    def _overlap_add_window(self, num_frames, window=None):
+        """以逐幀重疊相加計算視窗權重。
+
+        Args:
+            num_frames (int): 幀數。
+            window (numpy.ndarray, optional): 要重疊相加的視窗。預設為 ``self.window``。
+
+        Returns:
+            numpy.ndarray: 重疊相加的視窗權重（未處理接近零的值）。
+        """
+        if window is None:
+            window = self.window
+        
+        norm_length = (num_frames - 1) * self.hop_length + self.window_size
+        norm = np.zeros(norm_length, dtype=self.dtype)
+        for i in range(num_frames):
+            start = i * self.hop_length
+            norm[start:start + self.window_size] += window
+        return norm
+
+    def _build_norm_templates(self):
+        """預先計算重疊相加權重的週期部分與首尾邊緣。
+
+        內部每個樣本都被相同數量的幀覆蓋，權重以步長為週期重複；只有首尾
+        ``window_size - hop_length`` 個樣本缺少部分幀的覆蓋，需個別計算。
+        接近零的權重在此一次設為1，iSTFT 時不需再掃描整個輸出信號。
+        """
+        # 週期部分：視窗補零到步長的倍數後，依步長摺疊相加
+        padded_length = -(-self.window_size // self.hop_length) * self.hop_length
+        padded_window = np.zeros(padded_length, dtype=self.dtype)
+        padded_window[:self.window_size] = self.window
+        self._norm_period = padded_window.reshape(-1, self.hop_length).sum(axis=0)
+        
+        # 首尾邊緣：只被部分幀覆蓋，尾端即反轉視窗的首端
+        edge_length = max(self.window_size - self.hop_length, 0)
+        edge_frames = -(-self.window_size // self.hop_length)
+        self._norm_head = self._overlap_add_window(edge_frames)[:edge_length]
+        self._norm_tail = self._overlap_add_window(edge_frames, self.window[::-1])[:edge_length][::-1]
+        
+        # 處理重疊部分的權重
+        for template in (self._norm_period, self._norm_head, self._norm_tail):
+            template[template < 1e-6] = 1
+
+    def _compute_norm(self, num_frames):
+        """計算指定幀數下重疊相加的視窗權重。
+
+        權重由預先計算的週期部分平鋪，再填入首尾邊緣；幀數過少以致首尾
+        重疊時才逐幀計算。
+
+        Args:
+            num_frames (int): 幀數。
+
+        Returns:
+            numpy.ndarray: 重疊相加的視窗權重（唯讀）。
+        """
+        norm_length = (num_frames - 1) * self.hop_length + self.window_size
+        edge_length = len(self._norm_head)
+        
+        if norm_length >= 2 * edge_length:
+            num_periods = -(-norm_length // self.hop_length)
+            norm = np.tile(self._norm_period, num_periods)[:norm_length]
+            norm[:edge_length] = self._norm_head
+            norm[norm_length - edge_length:] = self._norm_tail
+        else:
+            norm = self._overlap_add_window(num_frames)
+            norm[norm < 1e-6] = 1
+        
+        # 快取的權重由多次呼叫共用，不允許修改
+        norm.setflags(write=False)
+        return norm
+
+    def _get_norm(self, num_frames):
+        """獲取指定幀數下重疊相加的視窗權重。
+
+        結果以幀數為鍵快取，只保留最近使用的 ``NORM_CACHE_SIZE`` 份。快取為
+        一般的 ``OrderedDict``，處理器仍可被 pickle 與複製。
+
+        Args:
+            num_frames (int): 幀數。
+
+        Returns:
+            numpy.ndarray: 重疊相加的視窗權重（唯讀）。
+        """
+        norm = self._norm_cache.get(num_frames)
+        if norm is None:
+            norm = self._compute_norm(num_frames)
+            self._norm_cache[num_frames] = norm
+            # 超過上限時移除最久未使用的權重
+            while len(self._norm_cache) > NORM_CACHE_SIZE:
+                try:
+                    self._norm_cache.popitem(last=False)
+                except KeyError:
+                    break
+        else:
+            try:
+                self._norm_cache.move_to_end(num_frames)
+            except KeyError:
+                # 其他執行緒已移除此項
+                pass
+        
+        return norm
+
+    def _num_workers(self):
+        """計算實際使用的執行緒數量。
+
+        Returns:
+            int: 執行緒數量。
+        """
+        if self.workers > 0:
+            return self.workers
+        return max(1, (os.cpu_count() or 1) + 1 + self.workers)
+
+    def _map_frames(self, transform, data, axis):
+        """將批次轉換沿幀軸分段，以多執行緒平行執行。
+
+        NumPy 的 FFT 在大型數組上會釋放 GIL，因此執行緒可以真正平行計算。
+
+        Args:
+            transform (callable): 作用於單段數據的轉換函數。
+            data (numpy.ndarray): 要轉換的數據。
+            axis (int): 幀所在的軸。
+
+        Returns:
+            numpy.ndarray: 轉換結果。
+        """
+        num_workers = min(self._num_workers(), data.shape[axis])
+        if num_workers <= 1:
+            return transform(data)
+        
+        chunks = np.array_split(data, num_workers, axis=axis)
+        with ThreadPoolExecutor(max_workers=num_workers) as pool:
+            return np.concatenate(list(pool.map(transform, chunks)), axis=axis)
+
+    def _rfft(self, frames):
+        """沿最後一軸對整批幀執行實數 FFT。
+
+        輸入應為 stft 每次呼叫配置的加窗幀：scipy 後端允許 FFT 覆寫其內容。
+
+        Args:
+            frames (numpy.ndarray): 形狀為 ``(num_frames, window_size)`` 的加窗幀。
+
+        Returns:
+            numpy.ndarray: 形狀為 ``(num_frames, window_size // 2 + 1)`` 的頻譜。
+        """
+        if self._use_gpu(len(frames)):
+            return self._gpu_rfft(frames)
+        if self.backend == 'numpy':
+            return self._map_frames(lambda chunk: np.fft.rfft(chunk, axis=1), frames, axis=0)
+        return scipy.fft.rfft(frames, axis=1, workers=self.workers, overwrite_x=True)
+
+    def _irfft(self, spectra):
+        """沿最後一軸對整批頻譜執行實數 iFFT。
+
+        Args:
+            spectra (numpy.ndarray): 形狀為 ``(num_frames, window_size // 2 + 1)`` 的頻譜。
+
+        Returns:
+            numpy.ndarray: 形狀為 ``(num_frames, window_size)`` 的時域幀。
+        """
+        if self._use_gpu(len(spectra)):
+            return self._gpu_irfft(spectra)
+        if self.backend == 'numpy':
+            return self._map_frames(lambda chunk: np.fft.irfft(chunk, n=self.window_size, axis=1),
+                                    spectra, axis=0)
+        return scipy.fft.irfft(spectra, n=self.window_size, axis=1, workers=self.workers)
+
+    def _frame_view(self, audio_signal):
+        """建立音訊信號的零拷貝幀視圖。
+
+        Args:
+            audio_signal (numpy.ndarray): 連續記憶體的一維音訊信號。
+
+        Returns:
+            numpy.ndarray: 形狀為 ``(num_frames, window_size)`` 的唯讀步長視圖。
+        """
+        num_frames = 1 + (len(audio_signal) - self.window_size) // self.hop_length
+        itemsize = audio_signal.itemsize
+        return np.lib.stride_tricks.as_strided(
+            audio_signal,
+            shape=(num_frames, self.window_size),
+            strides=(self.hop_length * itemsize, itemsize),
+            writeable=False
+        )
 
     def stft(self, audio_signal):
         """執行短時傅立葉轉換。
 
+        以步長切出所有幀的零拷貝視圖，一次套用視窗函數後對整批幀執行
+        實數 FFT，只保留非負頻率的 ``window_size // 2 + 1`` 個頻率點。
+
         Args:
             audio_signal (numpy.ndarray): 輸入的音訊信號。
 
         Returns:
-            numpy.ndarray: STFT 頻譜圖（複數值）。
+            numpy.ndarray: STFT 頻譜圖（複數值），形狀為
+            ``(window_size // 2 + 1, num_frames)``。``dtype`` 為 ``float32``
+            時輸出 ``complex64``。
         """
-        # 計算需要的幀數
+        audio_signal = np.ascontiguousarray(audio_signal, dtype=self.dtype)
+        
+        if self.backend == 'numba':
+            num_frames = 1 + (len(audio_signal) - self.window_size) // self.hop_length
+            stft_matrix = _stft_core(audio_signal.astype(np.float64),
+                                     self.window.astype(np.float64),
+                                     self.hop_length, num_frames)
+            return stft_matrix.astype(np.complex64 if self.dtype == np.float32 else np.complex128,
+                                      copy=False)
+        
+        # 建立 (num_frames, window_size) 的幀視圖，不複製數據
+        frames = self._frame_view(audio_signal)
+        
+        # 一次套用視窗函數並批次執行 FFT；加窗幀每次呼叫各自以對齊方式配置，
+        # 同一個處理器可在多個執行緒中同時使用，且不會在呼叫後保留整段信號大小的緩衝區
+        windowed_frames = _aligned_empty(frames.shape, self.dtype)
+        np.multiply(frames, self.window, out=windowed_frames)
+        stft_matrix = self._rfft(windowed_frames).T
+        
+        if self.dtype == np.float32:
+            stft_matrix = stft_matrix.astype(np.complex64, copy=False)
+        
+        return stft_matrix
+
+    def stft_streaming(self, audio_signal, block_frames=256):
+        """逐塊執行短時傅立葉轉換。
+
+        每次只計算 ``block_frames`` 個幀，使工作集維持在快取可容納的大小，
+        適合處理無法一次放入記憶體的長音訊。
+
+        Args:
+            audio_signal (numpy.ndarray): 輸入的音訊信號。
+            block_frames (int, optional): 每塊的幀數。預設為256。
+
+        Yields:
+            tuple: (起始幀編號, 形狀為 ``(window_size // 2 + 1, 幀數)`` 的 STFT 區塊)。
+        """
+        audio_signal = np.ascontiguousarray(audio_signal, dtype=self.dtype)
         num_frames = 1 + (len(audio_signal) - self.window_size) // self.hop_length
         
-        # 初始化 STFT 矩陣
-        stft_matrix = np.zeros((self.window_size, num_frames), dtype=np.complex128)
+        for start_frame in range(0, num_frames, block_frames):
+            stop_frame = min(start_frame + block_frames, num_frames)
+            start = start_frame * self.hop_length
+            end = (stop_frame - 1) * self.hop_length + self.window_size
+            yield start_frame, self.stft(audio_signal[start:end])
+
+    def stft_to_memmap(self, audio_signal, file_path, block_frames=256):
+        """逐塊執行短時傅立葉轉換並寫入記憶體映射的 ``.npy`` 檔案。
+
+        Args:
+            audio_signal (numpy.ndarray): 輸入的音訊信號。
+            file_path (str): 要保存的 ``.npy`` 檔案路徑。
+            block_frames (int, optional): 每塊的幀數。預設為256。
+
+        Returns:
+            numpy.memmap: 形狀為 ``(window_size // 2 + 1, num_frames)`` 的 STFT 頻譜圖。
+        """
+        num_frames = 1 + (len(audio_signal) - self.window_size) // self.hop_length
+        stft_matrix = np.lib.format.open_memmap(
+            file_path,
+            mode='w+',
+            dtype=np.result_type(self.dtype, np.complex64),
+            shape=(self.window_size // 2 + 1, num_frames),
+            fortran_order=True
+        )
         
-        # 執行 STFT
-        for i in range(num_frames):
-            # 提取當前幀
-            start = i * self.hop_length
-            end = start + self.window_size
-            frame = audio_signal[start:end]
-            
-            # 應用視窗函數並執行 FFT
-            windowed_frame = frame * self.window
-            stft_matrix[:, i] = np.fft.fft(windowed_frame)
+        for start_frame, stft_block in self.stft_streaming(audio_signal, block_frames):
+            stft_matrix[:, start_frame:start_frame + stft_block.shape[1]] = stft_block
         
+        stft_matrix.flush()
         return stft_matrix
 
     def istft(self, stft_matrix):
         """執行逆短時傅立葉轉換。
 
         Args:
-            stft_matrix (numpy.ndarray): STFT 頻譜圖（複數值）。
+            stft_matrix (numpy.ndarray): STFT 頻譜圖（複數值），形狀為
+                ``(window_size // 2 + 1, num_frames)``。
 
         Returns:
             numpy.ndarray: 重構的音訊信號。
+
+        Raises:
+            ValueError: 當頻譜圖的頻率點數與視窗大小不符時。
         """
+        num_bins = self.window_size // 2 + 1
+        if stft_matrix.shape[0] != num_bins:
+            raise ValueError(f"Expected an rfft spectrogram with {num_bins} frequency bins, "
+                             f"got {stft_matrix.shape[0]}")
+        
         num_frames = stft_matrix.shape[1]
         expected_signal_length = (num_frames - 1) * self.hop_length + self.window_size
         
-        # 初始化輸出信號和重疊相加的權重
-        output_signal = np.zeros(expected_signal_length)
-        window_sum = np.zeros(expected_signal_length)
+        if self.backend == 'numba':
+            spectra = np.ascontiguousarray(stft_matrix.T, dtype=np.complex128)
+            output_signal = _istft_core(spectra, self.window.astype(np.float64), self.hop_length,
+                                        self._get_norm(num_frames).astype(np.float64))
+            return output_signal.astype(self.dtype, copy=False)
         
-        # 對每一幀執行 iFFT 並重疊相加
-        for i in range(num_frames):
-            # 執行 iFFT
-            frame = np.real(np.fft.ifft(stft_matrix[:, i]))
-            
-            # 應用視窗函數
-            frame = frame * self.window
-            
-            # 計算當前幀的位置
-            start = i * self.hop_length
-            end = start + self.window_size
-            
-            # 重疊相加
-            output_signal[start:end] += frame
-            window_sum[start:end] += self.window
+        # 對所有幀一次執行實數 iFFT 並套用視窗函數；stft 的輸出轉置後即為
+        # 以幀為主的連續記憶體，iFFT 直接輸出實數幀，不需複製或取實部
+        frames = self._irfft(stft_matrix.T)
+        frames *= self.window
         
-        # 處理重疊部分的權重
-        window_sum[window_sum < 1e-6] = 1
-        output_signal /= window_sum
+        # 每個幀樣本在輸出信號中的位置
+        frame_starts = np.arange(num_frames) * self.hop_length
+        sample_indices = (frame_starts[:, None] + np.arange(self.window_size)).ravel()
+        
+        # 以 bincount 一次完成所有幀的重疊相加
+        output_signal = np.bincount(sample_indices, weights=frames.ravel(),
+                                    minlength=expected_signal_length)
+        output_signal /= self._get_norm(num_frames)
         
-        return output_signal
+        return output_signal.astype(self.dtype, copy=False)
 
     def compute_snr(self, original_signal, reconstructed_signal):
         """計算信噪比（SNR）。
@@ -130,26 +514,33 @@ class STFTProcessor:
         """
         # 確保信號長度相同
         min_length = min(len(original_signal), len(reconstructed_signal))
-        original_signal = original_signal[:min_length]
-        reconstructed_signal = reconstructed_signal[:min_length]
+        original_signal = np.asarray(original_signal)[:min_length]
+        reconstructed_signal = np.asarray(reconstructed_signal)[:min_length]
         
-        # 計算信噪比
-        noise = original_signal - reconstructed_signal
-        snr = 10 * np.log10(np.sum(original_signal**2) / np.sum(noise**2))
+        # 計算信噪比（以內積計算能量，不產生平方後的暫存數組）
+        noise = np.empty(min_length, dtype=np.result_type(original_signal, reconstructed_signal))
+        np.subtract(original_signal, reconstructed_signal, out=noise)
+        snr = 10 * np.log10(np.dot(original_signal, original_signal) / np.dot(noise, noise))
         
         return snr
 
     def save_results(self, stft_matrix, snr):
         """保存 STFT 分析結果。
 
+        頻譜圖以二進位 ``.npz`` 檔案保存，純量參數另存於同名的 JSON 檔案。
+
         Args:
             stft_matrix (numpy.ndarray): STFT 頻譜圖。
             snr (float): 信噪比。
 
         Returns:
-            str: 保存的檔案路徑。
+            str: 保存的數據檔案路徑（``.npz``）。
         """
-        data = {
+        basename = f'STFT_Data_Exp{self.experiment_id}_{self.date}'
+        filename = f'{basename}.npz'
+        np.savez_compressed(filename, stft=stft_matrix, window=self.window)
+        
+        metadata = {
             "experiment_id": self.experiment_id,
             "date": self.date,
             "window_size": self.window_size,
@@ -157,13 +548,9 @@ class STFTProcessor:
             "window_type": self.window_type,
             "snr": float(snr),
             "stft_shape": stft_matrix.shape,
-            # 儲存複數值的實部和虛部
-            "stft_real": stft_matrix.real.tolist(),
-            "stft_imag": stft_matrix.imag.tolist()
+            "data_file": filename
         }
         
-        filename = f'STFT_Data_Exp{self.experiment_id}_{self.date}.json'
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=4)
+        dump_json(metadata, f'{basename}.json')
         
-        return filename
\ No newline at end of file
+        return filename
@@ -2,15 +2,177 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
-import matplotlib.pyplot as plt
+import scipy.fft
 import datetime
+import functools
 import os
-import json
+import threading
 
-class FFTAnalyzer:
+from ._json import dump_json
+from ._memory import _aligned_empty
+from ._mixins import DateMixin
+from ._numba import njit, prange, NUMBA_AVAILABLE, ROCKET_FFT_AVAILABLE
+
+try:
+    import pyfftw
+    import pyfftw.builders
+except ImportError:
+    pyfftw = None
+
+
+# FFTW 只在變換長度達到此值時使用多執行緒；較短的變換執行緒開銷高於收益
+FFTW_THREADS_MIN_SIZE = 1 << 15
+
+# FFTW 計畫持有固定的輸入與輸出數組，因此每個執行緒各自保存一份計畫快取
+_plan_local = threading.local()
+
+
+def _build_rfft_plan(n, dtype):
+    """建立指定長度與精度的 FFTW 實數 FFT 計畫（需要 pyfftw）。
+
+    Args:
+        n (int): 變換長度。
+        dtype (numpy.dtype): 輸入的實數精度。
+
+    Returns:
+        pyfftw.FFTW: 輸入數組已對齊配置的 FFTW 計畫。
+    """
+    input_array = pyfftw.empty_aligned(n, dtype=dtype, n=64)
+    threads = (os.cpu_count() or 1) if n >= FFTW_THREADS_MIN_SIZE else 1
+    return pyfftw.builders.rfft(input_array, threads=threads)
+
+
+def _get_rfft_plan(n, dtype):
+    """獲取目前執行緒中指定長度與精度的 FFTW 實數 FFT 計畫。
+
+    旋轉因子與計畫只在每個執行緒第一次使用某個 ``(n, dtype)`` 時建立，
+    之後重複使用；不同執行緒不會共用計畫的輸入數組。
+
+    Args:
+        n (int): 變換長度。
+        dtype (numpy.dtype): 輸入的實數精度。
+
+    Returns:
+        pyfftw.FFTW: 只屬於目前執行緒的 FFTW 計畫。
+    """
+    cache = getattr(_plan_local, 'cache', None)
+    if cache is None:
+        cache = _plan_local.cache = functools.lru_cache(maxsize=16)(_build_rfft_plan)
+    return cache(n, dtype)
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _generate_signal_core(freq, duration, t, signal):
+    """以單一平行迴圈生成時間序列與三個諧波的合成信號（需要 numba）。"""
+    n = t.shape[0]
+    dt = duration / n
+    for i in prange(n):
+        ti = i * dt
+        t[i] = ti
+        phase = 2 * np.pi * freq * ti
+        signal[i] = np.sin(phase) + 0.5 * np.sin(2 * phase) + 0.25 * np.sin(3 * phase)
+
+
+@functools.lru_cache(maxsize=16)
+def _twiddle_table(n):
+    """建立並快取長度為 ``n`` 的基數2 FFT 旋轉因子表。
+
+    Args:
+        n (int): 變換長度（2的冪次）。
+
+    Returns:
+        numpy.ndarray: ``exp(-2j * pi * k / n)``，``k = 0 .. n/2 - 1``。
+    """
+    twiddles = np.exp(-2j * np.pi * np.arange(n // 2) / n)
+    twiddles.setflags(write=False)
+    return twiddles
+
+
+@njit(cache=True)
+def _fft_iter(x, twiddles):
+    """迭代式基數2 Cooley-Tukey FFT（長度需為2的冪次）。
+
+    先做位元反轉排列，再由小到大逐級執行蝶形運算，全程不需遞迴。
+    """
+    n = x.shape[0]
+    out = x.astype(np.complex128)
+    
+    # 位元反轉排列
+    j = 0
+    for i in range(1, n):
+        bit = n >> 1
+        while j & bit:
+            j ^= bit
+            bit >>= 1
+        j ^= bit
+        if i < j:
+            tmp = out[i]
+            out[i] = out[j]
+            out[j] = tmp
+    
+    # 逐級蝶形運算
+    size = 2
+    while size <= n:
+        half = size // 2
+        step = n // size
+        for start in range(0, n, size):
+            for k in range(half):
+                a = out[start + k]
+                b = out[start + k + half] * twiddles[k * step]
+                out[start + k] = a + b
+                out[start + k + half] = a - b
+        size *= 2
+    
+    return out
+
+
+@njit(cache=True)
+def _fft_rocket(x):
+    """在 nopython 模式下呼叫 Rocket-FFT 提供的 numpy.fft.fft。"""
+    return np.fft.fft(x)
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _mae_core(a, b):
+    """以單次平行走訪計算平均絕對誤差，不配置中間陣列。"""
+    n = a.shape[0]
+    total = 0.0
+    for i in prange(n):
+        total += abs(a[i] - b[i])
+    return total / n
+
+
+def _one_sided_magnitude(fft_result, n, nfast):
+    """由實數 FFT 結果計算單邊幅值頻譜。
+
+    幅值直接寫入預先配置的數組並原地縮放，不產生中間數組。補零不增加信號
+    能量，因此以原始長度 ``n`` 正規化；直流與Nyquist頻率沒有對應的負頻率，
+    不需加倍。
+
+    Args:
+        fft_result (numpy.ndarray): 沿最後一軸、長度為 ``nfast`` 的實數 FFT 結果。
+        n (int): 補零前的信號長度。
+        nfast (int): 實際的變換長度。
+
+    Returns:
+        numpy.ndarray: 與 ``fft_result`` 同形狀的單邊幅值。
+    """
+    magnitude = np.empty(fft_result.shape, dtype=fft_result.real.dtype)
+    np.abs(fft_result, out=magnitude)
+    np.multiply(magnitude, 2.0 / n, out=magnitude)
+    
+    magnitude[..., 0] /= 2
+    if nfast % 2 == 0:
+        magnitude[..., -1] /= 2
+    return magnitude
+
+
+class FFTAnalyzer(DateMixin):
     """FFT分析器類別。
 
-    此類別提供快速傅立葉變換(FFT)和逆變換(iFFT)的功能。
+    此類別提供快速傅立葉變換(FFT)和逆變換(iFFT)的功能。變換使用 scipy.fft 的
+    pocketfft 後端，支援 SIMD 向量化與多執行緒計算；若已安裝 pyfftw，
+    perform_fft 會改用依長度快取的 FFTW 計畫。
 
     Attributes:
         experiment_id (int): 實驗編號。
@@ -24,54 +186,189 @@ class FFTAnalyzer:
             experiment_id (int, optional): 實驗編號。預設為1。
         """
         self.experiment_id = experiment_id
-        self.date = datetime.datetime.now().strftime("%Y%m%d")
+        self._date = None
 
-    def generate_signal(self, freq=5, duration=1, sampling_rate=1000):
+    def generate_signal(self, freq=5, duration=1, sampling_rate=1000, dtype=np.float32):
         """生成包含多個頻率組件的測試信號。
 
         Args:
             freq (int, optional): 基礎頻率，單位Hz。預設為5。
             duration (int, optional): 信號持續時間，單位秒。預設為1。
             sampling_rate (int, optional): 採樣率，單位Hz。預設為1000。
+            dtype (numpy.dtype, optional): 信號的實數精度。預設為numpy.float32。
 
         Returns:
             tuple: 包含時間序列向量、信號向量和頻率向量的元組。
         """
-        t = np.linspace(0, duration, int(sampling_rate * duration), endpoint=False)
-        signal = (np.sin(2 * np.pi * freq * t) + 
-                0.5 * np.sin(2 * np.pi * 2 * freq * t) + 
-                0.25 * np.sin(2 * np.pi * 3 * freq * t))
+        n = int(sampling_rate * duration)
+        if NUMBA_AVAILABLE and n > 0:
+            # 三個正弦波在同一個迴圈中計算，不產生中間數組
+            t = np.empty(n, dtype=dtype)
+            signal = np.empty(n, dtype=dtype)
+            _generate_signal_core(float(freq), float(duration), t, signal)
+        else:
+            # 時間與相位以 float64 計算，與 Numba 路徑一致；長信號的相位在單精度下
+            # 誤差會隨時間累積，只有完成的結果才轉換為 dtype
+            samples = np.arange(n, dtype=np.float64)
+            dt = duration / n if n else 0.0
+            t = (samples * dt).astype(dtype, copy=False)
+            # 相位只計算一次，諧波以就地加法累加
+            phase = samples * (2 * np.pi * freq * dt)
+            signal = np.sin(phase)
+            signal += 0.5 * np.sin(2 * phase)
+            signal += 0.25 * np.sin(3 * phase)
+            signal = signal.astype(dtype, copy=False)
         
         return t, signal, [freq, 2*freq, 3*freq]
 
-    def perform_fft(self, signal, sampling_rate):
+    def perform_fft(self, signal, sampling_rate, dtype=np.float32):
         """執行快速傅立葉變換(FFT)。
 
+        信號長度 ``n`` 會以補零延伸至 ``nfast = scipy.fft.next_fast_len(n, real=True)``，
+        讓質因數較大的長度也能走快速的 FFT 路徑。``n`` 本身已是快速長度時
+        （例如 1000）不會補零，輸出與未補零時完全相同；否則輸出長度變為
+        ``nfast // 2 + 1``，頻率間隔變為 ``sampling_rate / nfast``。
+
         Args:
             signal (numpy.ndarray): 輸入信號數據。
             sampling_rate (int): 信號的採樣率，單位Hz。
+            dtype (numpy.dtype, optional): 計算使用的實數精度。預設為numpy.float32，
+                幅值頻譜只用於顯示和峰值偵測，單精度已足夠。
 
         Returns:
-            tuple: 包含頻率向量和對應幅值的元組。
+            tuple: 包含非負頻率向量（``nfast // 2 + 1`` 點）和對應單邊幅值的元組。
         """
+        # 切片或非連續視圖先轉為連續數組，FFT 不需在內部另行複製
+        signal = np.ascontiguousarray(signal, dtype=dtype)
         n = len(signal)
-        fft_result = np.fft.fft(signal)
-        freq = np.fft.fftfreq(n, 1/sampling_rate)
-        magnitude = np.abs(fft_result) / n * 2
+        nfast = scipy.fft.next_fast_len(n, real=True)
+        if pyfftw is not None:
+            # 將輸入複製到快取計畫的對齊輸入數組，其餘部分補零後執行
+            plan = _get_rfft_plan(nfast, signal.dtype)
+            plan.input_array[:n] = signal
+            plan.input_array[n:] = 0
+            fft_result = plan()
+        elif nfast > n or signal.ctypes.data % 64:
+            # 需要補零或輸入未對齊時，複製到本次呼叫配置的對齊緩衝區
+            buffer = _aligned_empty(nfast, signal.dtype)
+            buffer[:n] = signal
+            buffer[n:] = 0
+            fft_result = scipy.fft.rfft(buffer, workers=-1)
+        else:
+            fft_result = scipy.fft.rfft(signal, workers=-1)
+        freq = scipy.fft.rfftfreq(nfast, 1/sampling_rate)
         
-        positive_freq_mask = freq >= 0
-        return freq[positive_freq_mask], magnitude[positive_freq_mask]
+        return freq, _one_sided_magnitude(fft_result, n, nfast)
+
+    def perform_fft_batch(self, signals, sampling_rate, dtype=np.float32):
+        """對多個等長信號一次執行快速傅立葉變換(FFT)。
 
-    def perform_ifft(self, fft_result):
+        整批信號以單一二維實數 FFT 沿 ``axis=1`` 計算，計畫建立與呼叫開銷只需
+        一次，並可在批次維度上向量化；有多個信號時應盡量使用此方法，
+        而非逐一呼叫 :meth:`perform_fft`。補零與幅值正規化方式與
+        :meth:`perform_fft` 相同。
+
+        Args:
+            signals (numpy.ndarray): 形狀為 ``(B, N)`` 的信號數據，每列一個信號。
+            sampling_rate (int): 信號的採樣率，單位Hz。
+            dtype (numpy.dtype, optional): 計算使用的實數精度。預設為numpy.float32。
+
+        Returns:
+            tuple: 包含非負頻率向量（``nfast // 2 + 1`` 點）和形狀為
+            ``(B, nfast // 2 + 1)`` 的單邊幅值數組的元組。
+
+        Raises:
+            ValueError: 當輸入不是二維數組時。
+        """
+        signals = np.ascontiguousarray(signals, dtype=dtype)
+        if signals.ndim != 2:
+            raise ValueError(f"Unsupported signals shape: {signals.shape}, expected (B, N)")
+        
+        n = signals.shape[1]
+        nfast = scipy.fft.next_fast_len(n, real=True)
+        fft_result = scipy.fft.rfft(signals, n=nfast, axis=1, workers=-1)
+        freq = scipy.fft.rfftfreq(nfast, 1/sampling_rate)
+        
+        return freq, _one_sided_magnitude(fft_result, n, nfast)
+
+    @staticmethod
+    def _fft_numba(signal):
+        """以 Numba 編譯的 FFT 計算完整（雙邊）頻譜。
+
+        供需要在 JIT 流程中計算 FFT 的場合使用：已安裝 Rocket-FFT 時使用其
+        任意長度的 pocketfft 實作，否則使用迭代式基數2 FFT。
+
+        Args:
+            signal (numpy.ndarray): 輸入信號數據。
+
+        Returns:
+            numpy.ndarray: 複數 FFT 結果。
+
+        Raises:
+            ImportError: 當 numba 未安裝時。
+            ValueError: 當未安裝 Rocket-FFT 且信號長度不是2的冪次時。
+        """
+        if not NUMBA_AVAILABLE:
+            raise ImportError("_fft_numba requires numba to be installed")
+        
+        signal = np.ascontiguousarray(signal)
+        if ROCKET_FFT_AVAILABLE:
+            return _fft_rocket(signal)
+        
+        n = len(signal)
+        if n == 0 or n & (n - 1):
+            raise ValueError("Signal length must be a power of two without rocket-fft")
+        return _fft_iter(signal, _twiddle_table(n))
+
+    @staticmethod
+    def _mae(a, b):
+        """計算兩個信號之間的平均絕對誤差（MAE）。
+
+        Args:
+            a (numpy.ndarray): 第一個信號。
+            b (numpy.ndarray): 第二個信號，形狀需與 ``a`` 相同。
+
+        Returns:
+            float: ``mean(|a - b|)``。
+
+        Raises:
+            ValueError: 當兩個信號的形狀不同或為空時。
+        """
+        a = np.asarray(a)
+        b = np.asarray(b)
+        if a.shape != b.shape:
+            raise ValueError(f"Unsupported shapes: {a.shape} and {b.shape}, expected equal shapes")
+        if a.size == 0:
+            raise ValueError("Unsupported empty signals, expected at least one sample")
+        
+        # 轉為浮點數，避免無號整數相減時溢位回繞
+        dtype = np.result_type(a.dtype, b.dtype, np.float32)
+        a = np.ascontiguousarray(a, dtype=dtype).ravel()
+        b = np.ascontiguousarray(b, dtype=dtype).ravel()
+        if NUMBA_AVAILABLE:
+            return float(_mae_core(a, b))
+        
+        # 未安裝 numba 時重複使用同一個緩衝區
+        buffer = np.subtract(a, b)
+        np.abs(buffer, out=buffer)
+        return float(buffer.mean())
+
+    def perform_ifft(self, fft_result, dtype=None):
         """執行逆快速傅立葉變換(iFFT)。
 
+        輸入為完整（雙邊）的FFT結果，因此使用複數 iFFT 而非 irfft。
+
         Args:
             fft_result (numpy.ndarray): FFT變換後的複數結果。
+            dtype (numpy.dtype, optional): 計算使用的實數精度，例如numpy.float32。
+                預設為None，沿用輸入的精度，以保持重構誤差不受影響。
 
         Returns:
             numpy.ndarray: 重構後的時域信號。
         """
-        return np.fft.ifft(fft_result).real
+        if dtype is not None:
+            fft_result = np.asarray(fft_result, dtype=np.result_type(dtype, np.complex64))
+        return scipy.fft.ifft(fft_result, workers=-1).real
 
     def plot_results(self, t, original_signal, reconstructed_signal, freq, magnitude, target_freqs):
         """繪製原始信號、FFT頻譜和重構信號的圖表。
@@ -87,7 +384,11 @@ class FFTAnalyzer:
         Returns:
             str: 保存的圖表文件路徑。
         """
-        fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(12, 10))
+        # 延遲匯入 matplotlib，並直接使用 Figure 以免依賴 pyplot 的繪圖後端
+        from matplotlib.figure import Figure
+        
+        fig = Figure(figsize=(12, 10))
+        ax1, ax2, ax3 = fig.subplots(3, 1)
         
         ax1.plot(t, original_signal)
         ax1.set_title('原始信號 (Original Signal)')
@@ -95,7 +396,9 @@ class FFTAnalyzer:
         ax1.set_ylabel('振幅')
         ax1.grid(True)
         
-        ax2.stem(freq, magnitude)
+        # vlines 以單一 LineCollection 繪製所有頻率點，避免 stem 在長頻譜上的繪圖開銷
+        ax2.vlines(freq, 0, magnitude, linewidth=0.5)
+        ax2.plot(freq, magnitude, 'o', markersize=2)
         ax2.set_title('FFT 頻譜 (FFT Spectrum)')
         ax2.set_xlabel('頻率 (Hz)')
         ax2.set_ylabel('幅值')
@@ -114,14 +417,15 @@ class FFTAnalyzer:
                     fontsize=16)
         
         filename = f'FFT_Example_Exp{self.experiment_id}_{self.date}_plot_results.png'
-        plt.tight_layout()
-        plt.savefig(filename)
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(filename)
         
         return filename
 
     def save_data(self, t, original_signal, reconstructed_signal, freq, magnitude, target_freqs):
-        """保存實驗數據到JSON檔案。
+        """保存實驗數據到NPZ檔案。
+
+        數組以二進位 ``.npz`` 檔案保存，純量參數另存於同名的 JSON 檔案。
 
         Args:
             t (numpy.ndarray): 時間序列。
@@ -132,22 +436,27 @@ class FFTAnalyzer:
             target_freqs (list): 輸入信號的目標頻率列表。
 
         Returns:
-            str: 保存的數據檔案路徑。
+            str: 保存的數據檔案路徑（``.npz``）。
         """
-        data = {
+        basename = f'FFT_Data_Exp{self.experiment_id}_{self.date}_save_data'
+        filename = f'{basename}.npz'
+        np.savez_compressed(
+            filename,
+            time_series=t,
+            original_signal=original_signal,
+            reconstructed_signal=reconstructed_signal,
+            fft_frequencies=freq,
+            fft_magnitude=magnitude
+        )
+        
+        metadata = {
             "experiment_id": self.experiment_id,
             "date": self.date,
             "target_frequencies": target_freqs,
-            "time_series": t.tolist(),
-            "original_signal": original_signal.tolist(),
-            "reconstructed_signal": reconstructed_signal.tolist(),
-            "fft_frequencies": freq.tolist(),
-            "fft_magnitude": magnitude.tolist()
+            "data_file": filename
         }
         
-        filename = f'FFT_Data_Exp{self.experiment_id}_{self.date}_save_data.json'
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=4)
+        dump_json(metadata, f'{basename}.json')
         
         return filename
 
@@ -161,15 +470,8 @@ class FFTAnalyzer:
         """
         report_path = "REPORT.md"
         
-        if not os.path.exists(report_path):
-            with open(report_path, 'w', encoding='utf-8') as f:
-                f.write("# FFT 實驗報告\n\n")
-        
-        try:
-            with open(report_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except FileNotFoundError:
-            content = "# FFT 實驗報告\n\n"
+        # 僅在報告檔案不存在或為空時寫入標題
+        write_header = not os.path.exists(report_path) or os.path.getsize(report_path) == 0
         
         new_entry = f"""
 ## 實驗 #{self.experiment_id} - {self.date}
@@ -186,7 +488,8 @@ class FFTAnalyzer:
 ---
 """
         
-        updated_content = content + new_entry
-        
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(updated_content)
+        # 以附加模式只寫入新條目，不需讀取並重寫整份報告
+        with open(report_path, 'a', encoding='utf-8') as f:
+            if write_header:
+                f.write("# FFT 實驗報告\n\n")
+            f.write(new_entry)
@@ -3,25 +3,95 @@
 
 import numpy as np
 import librosa
-import matplotlib.pyplot as plt
 import datetime
-import json
+import functools
 import os
 
-class MelSpectrogramAnalyzer:
+from ._json import dump_json
+from ._mixins import DateMixin, FigureMixin
+from ._numba import njit, prange, NUMBA_AVAILABLE
+
+
+@functools.lru_cache(maxsize=32)
+def _mel_basis(sr, n_fft, n_mels, fmin, fmax, dtype):
+    """建立並快取梅爾濾波器組。
+
+    濾波器組是分析參數的確定性函數，相同參數的分析器共用同一份唯讀數組。
+
+    Args:
+        sr (int): 取樣率（Hz）。
+        n_fft (int): FFT 長度。
+        n_mels (int): 梅爾濾波器的數量。
+        fmin (float): 最小頻率（Hz）。
+        fmax (float): 最大頻率（Hz）。
+        dtype (numpy.dtype): 濾波器組的數據類型。
+
+    Returns:
+        numpy.ndarray: 形狀為 ``(n_mels, n_fft // 2 + 1)`` 的唯讀梅爾濾波器組。
+    """
+    mel_basis = librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=n_mels,
+                                    fmin=fmin, fmax=fmax, dtype=dtype)
+    mel_basis.setflags(write=False)
+    return mel_basis
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _power_to_db_core(S, amin, top_db):
+    """以單次平行走訪將功率頻譜轉換為相對於最大值的分貝刻度。"""
+    m, n = S.shape
+    # 10 / ln(10)
+    ref_db = 4.342944819 * np.log(max(S.max(), amin))
+    out = np.empty((m, n), S.dtype)
+    for i in prange(m):
+        for j in range(n):
+            # 以最大值為參考時頻譜峰值為 0 dB，因此動態範圍下限為 -top_db
+            value = 4.342944819 * np.log(max(S[i, j], amin)) - ref_db
+            out[i, j] = max(value, -top_db)
+    return out
+
+
+def _power_to_db(S, amin=1e-10, top_db=80.0):
+    """將功率頻譜轉換為分貝刻度，等同 ``librosa.power_to_db(S, ref=np.max)``。
+
+    Args:
+        S (numpy.ndarray): 非負的二維功率頻譜。
+        amin (float, optional): 取對數前的最小值。預設為1e-10。
+        top_db (float, optional): 相對於峰值的最大動態範圍（dB）。預設為80.0。
+
+    Returns:
+        numpy.ndarray: 分貝刻度的頻譜，數據類型與 ``S`` 相同。
+    """
+    if NUMBA_AVAILABLE:
+        return _power_to_db_core(np.ascontiguousarray(S), amin, top_db)
+    
+    # 未安裝 numba 時，在同一個緩衝區內就地完成運算
+    out = np.maximum(S, amin)
+    np.log10(out, out=out)
+    out *= 10
+    out -= out.max()
+    np.maximum(out, -top_db, out=out)
+    return out
+
+
+class MelSpectrogramAnalyzer(DateMixin, FigureMixin):
     """梅爾頻譜分析器類別。
 
     此類別提供計算和視覺化梅爾頻譜的功能，適用於音訊信號分析。
+    預設以單精度（``float32``）計算，結果最終以分貝顯示，單精度已足夠。
 
     Attributes:
         n_mels (int): 梅爾濾波器的數量。
         fmin (float): 最小頻率（Hz）。
         fmax (float): 最大頻率（Hz）。
+        dtype (numpy.dtype): 計算使用的實數精度。
+        n_fft (int): STFT 的 FFT 長度。
+        hop_length (int): STFT 的視窗移動步長。
         experiment_id (int): 實驗編號。
         date (str): 實驗日期（YYYYMMDD格式）。
     """
 
-    def __init__(self, n_mels=128, fmin=0.0, fmax=8000.0, experiment_id=1):
+    def __init__(self, n_mels=128, fmin=0.0, fmax=8000.0, experiment_id=1, dtype=np.float32,
+                 n_fft=2048, hop_length=512):
         """初始化梅爾頻譜分析器。
 
         Args:
@@ -29,12 +99,32 @@ class MelSpectrogramAnalyzer:
             fmin (float, optional): 最小頻率（Hz）。預設為0.0。
             fmax (float, optional): 最大頻率（Hz）。預設為8000.0。
             experiment_id (int, optional): 實驗編號。預設為1。
+            dtype (numpy.dtype, optional): 計算使用的實數精度。預設為numpy.float32。
+            n_fft (int, optional): STFT 的 FFT 長度。預設為2048。
+            hop_length (int, optional): STFT 的視窗移動步長。預設為512。
         """
         self.n_mels = n_mels
         self.fmin = fmin
         self.fmax = fmax
         self.experiment_id = experiment_id
-        self.date = datetime.datetime.now().strftime("%Y%m%d")
+        self.dtype = np.dtype(dtype)
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self._date = None
+        self._figure = None
+
+    def _get_mel_basis(self, sr):
+        """獲取指定取樣率的梅爾濾波器組。
+
+        濾波器組只由取樣率與分析參數決定，建立一次後即快取重複使用。
+
+        Args:
+            sr (int): 取樣率（Hz）。
+
+        Returns:
+            numpy.ndarray: 形狀為 ``(n_mels, n_fft // 2 + 1)`` 的唯讀梅爾濾波器組。
+        """
+        return _mel_basis(sr, self.n_fft, self.n_mels, self.fmin, self.fmax, self.dtype)
 
     def compute_melspectrogram(self, signal, sr):
         """計算輸入信號的梅爾頻譜。
@@ -46,16 +136,15 @@ class MelSpectrogramAnalyzer:
         Returns:
             numpy.ndarray: 梅爾頻譜。
         """
-        mel_spectrogram = librosa.feature.melspectrogram(
-            y=signal, 
-            sr=sr,
-            n_mels=self.n_mels,
-            fmin=self.fmin,
-            fmax=self.fmax
-        )
+        signal = np.asarray(signal, dtype=self.dtype)
+        
+        # 功率頻譜經快取的梅爾濾波器組投影（單一矩陣乘法）
+        power_spectrogram = np.abs(librosa.stft(signal, n_fft=self.n_fft,
+                                                hop_length=self.hop_length)) ** 2
+        mel_spectrogram = self._get_mel_basis(sr) @ power_spectrogram
         
         # 轉換為分貝刻度
-        mel_spectrogram_db = librosa.power_to_db(mel_spectrogram, ref=np.max)
+        mel_spectrogram_db = _power_to_db(mel_spectrogram)
         return mel_spectrogram_db
 
     def plot_melspectrogram(self, mel_spectrogram, sr):
@@ -68,48 +157,55 @@ class MelSpectrogramAnalyzer:
         Returns:
             str: 保存的圖片檔案路徑。
         """
-        plt.figure(figsize=(12, 8))
-        librosa.display.specshow(
+        fig = self._get_figure()
+        ax = fig.add_subplot()
+        # specshow 以 pcolormesh 繪製，點陣化後輸出不需逐格產生向量路徑
+        image = librosa.display.specshow(
             mel_spectrogram, 
             sr=sr,
+            hop_length=self.hop_length,
             fmin=self.fmin,
             fmax=self.fmax,
             x_axis='time',
-            y_axis='mel'
+            y_axis='mel',
+            ax=ax,
+            rasterized=True
         )
-        plt.colorbar(format='%+2.0f dB')
-        plt.title(f'梅爾頻譜圖 - 實驗#{self.experiment_id}_{self.date}')
+        fig.colorbar(image, ax=ax, format='%+2.0f dB')
+        ax.set_title(f'梅爾頻譜圖 - 實驗#{self.experiment_id}_{self.date}')
         
         filename = f'Mel_Spectrogram_Exp{self.experiment_id}_{self.date}.png'
-        plt.tight_layout()
-        plt.savefig(filename)
-        plt.close()
+        fig.savefig(filename, dpi=100, bbox_inches=None)
         
         return filename
 
     def save_data(self, mel_spectrogram, sr):
-        """保存梅爾頻譜數據到JSON檔案。
+        """保存梅爾頻譜數據到NPZ檔案。
+
+        頻譜數據以二進位 ``.npz`` 檔案保存，純量參數另存於同名的 JSON 檔案。
 
         Args:
             mel_spectrogram (numpy.ndarray): 梅爾頻譜數據。
             sr (int): 取樣率（Hz）。
 
         Returns:
-            str: 保存的數據檔案路徑。
+            str: 保存的數據檔案路徑（``.npz``）。
         """
-        data = {
+        basename = f'Mel_Data_Exp{self.experiment_id}_{self.date}'
+        filename = f'{basename}.npz'
+        np.savez_compressed(filename, mel_spectrogram=mel_spectrogram)
+        
+        metadata = {
             "experiment_id": self.experiment_id,
             "date": self.date,
             "n_mels": self.n_mels,
             "fmin": self.fmin,
             "fmax": self.fmax,
             "sampling_rate": sr,
-            "mel_spectrogram": mel_spectrogram.tolist()
+            "data_file": filename
         }
         
-        filename = f'Mel_Data_Exp{self.experiment_id}_{self.date}.json'
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=4)
+        dump_json(metadata, f'{basename}.json')
         
         return filename
 
@@ -122,15 +218,8 @@ class MelSpectrogramAnalyzer:
         """
         report_path = "REPORT.md"
         
-        if not os.path.exists(report_path):
-            with open(report_path, 'w', encoding='utf-8') as f:
-                f.write("# 頻譜分析實驗報告\n\n")
-        
-        try:
-            with open(report_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except FileNotFoundError:
-            content = "# 頻譜分析實驗報告\n\n"
+        # 僅在報告檔案不存在或為空時寫入標題
+        write_header = not os.path.exists(report_path) or os.path.getsize(report_path) == 0
         
         new_entry = f"""
 ## 梅爾頻譜分析 - 實驗 #{self.experiment_id} - {self.date}
@@ -147,7 +236,8 @@ class MelSpectrogramAnalyzer:
 ---
 """
         
-        updated_content = content + new_entry
-        
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(updated_content)
+        # 以附加模式只寫入新條目，不需讀取並重寫整份報告
+        with open(report_path, 'a', encoding='utf-8') as f:
+            if write_header:
+                f.write("# 頻譜分析實驗報告\n\n")
+            f.write(new_entry)
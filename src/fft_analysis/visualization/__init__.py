@@ -0,0 +1,9 @@
+"""視覺化模組。
+
+此模組提供頻譜分析結果的繪圖功能，包括：
+- STFT 時頻譜圖
+"""
+
+from .spectrogram import SpectrogramPlotter
+
+__all__ = ['SpectrogramPlotter']
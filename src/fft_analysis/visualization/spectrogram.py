@@ -2,9 +2,45 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
-import matplotlib.pyplot as plt
 
-class SpectrogramPlotter:
+from .._mixins import DateMixin, FigureMixin
+from .._numba import njit, prange, NUMBA_AVAILABLE
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _mag_db_core(stft_matrix):
+    """以單次走訪計算分貝刻度幅度，取代 abs、加法與 log10 三次走訪。"""
+    m, n = stft_matrix.shape
+    out = np.empty((m, n), np.float32)
+    for i in prange(m):
+        for j in range(n):
+            a = abs(stft_matrix[i, j])
+            # 20 / ln(10)，下限 1e-10 避免 log(0)
+            out[i, j] = 8.685889638 * np.log(max(a, 1e-10))
+    return out
+
+
+def _mag_db(stft_matrix):
+    """將 STFT 頻譜轉換為分貝刻度幅度。
+
+    Args:
+        stft_matrix (numpy.ndarray): STFT 頻譜圖。
+
+    Returns:
+        numpy.ndarray: ``20 * log10(max(|stft_matrix|, 1e-10))``，float32。
+    """
+    if NUMBA_AVAILABLE:
+        return _mag_db_core(np.ascontiguousarray(stft_matrix))
+    
+    # 未安裝 numba 時，在同一個緩衝區內就地完成運算
+    out = np.abs(stft_matrix).astype(np.float32, copy=False)
+    np.maximum(out, 1e-10, out=out)
+    np.log10(out, out=out)
+    out *= 20
+    return out
+
+
+class SpectrogramPlotter(DateMixin, FigureMixin):
     """時頻譜圖繪製器。
 
     此類提供 STFT 時頻譜圖的視覺化功能。
@@ -21,44 +57,51 @@ class SpectrogramPlotter:
             experiment_id (int, optional): 實驗編號。預設為1。
         """
         self.experiment_id = experiment_id
-        self.date = datetime.datetime.now().strftime("%Y%m%d")
+        self._date = None
+        self._figure = None
 
-    def plot_spectrogram(self, stft_matrix, sample_rate, hop_length):
+    def plot_spectrogram(self, stft_matrix, sample_rate, hop_length, n_fft=None):
         """繪製時頻譜圖。
 
         Args:
             stft_matrix (numpy.ndarray): STFT 頻譜圖。
             sample_rate (int): 取樣率。
             hop_length (int): STFT 的視窗移動步長。
+            n_fft (int, optional): STFT 的視窗大小。預設為None，
+                由單邊頻譜的列數推算為 ``(stft_matrix.shape[0] - 1) * 2``。
 
         Returns:
             str: 保存的圖片檔案路徑。
         """
         # 計算時間和頻率軸
         time = np.arange(stft_matrix.shape[1]) * hop_length / sample_rate
-        freq = np.fft.fftfreq(stft_matrix.shape[0], 1/sample_rate)
+        # 實數信號的 STFT 只包含非負頻率的 n_fft/2+1 個頻率點
+        if n_fft is None:
+            n_fft = (stft_matrix.shape[0] - 1) * 2
+        freq = np.fft.rfftfreq(n_fft, 1/sample_rate)
         
         # 轉換為分貝刻度
-        magnitude_db = 20 * np.log10(np.abs(stft_matrix) + 1e-10)
+        magnitude_db = _mag_db(stft_matrix)
         
-        # 繪製時頻譜圖
-        plt.figure(figsize=(12, 8))
-        plt.imshow(
+        # 繪製時頻譜圖（點陣化並使用最近鄰插值以加快輸出）
+        fig = self._get_figure()
+        ax = fig.add_subplot()
+        image = ax.imshow(
             magnitude_db,
             aspect='auto',
             origin='lower',
-            extent=[time[0], time[-1], freq[0], freq[-1]]
+            extent=[time[0], time[-1], freq[0], freq[-1]],
+            interpolation='nearest',
+            rasterized=True
         )
         
-        plt.colorbar(label='Magnitude (dB)')
-        plt.xlabel('Time (s)')
-        plt.ylabel('Frequency (Hz)')
-        plt.title(f'STFT Spectrogram - Exp#{self.experiment_id}_{self.date}')
+        fig.colorbar(image, ax=ax, label='Magnitude (dB)')
+        ax.set_xlabel('Time (s)')
+        ax.set_ylabel('Frequency (Hz)')
+        ax.set_title(f'STFT Spectrogram - Exp#{self.experiment_id}_{self.date}')
         
         # 保存圖片
         filename = f'STFT_Spectrogram_Exp{self.experiment_id}_{self.date}.png'
-        plt.tight_layout()
-        plt.savefig(filename)
-        plt.close()
+        fig.savefig(filename, dpi=100, bbox_inches=None)
         
         return filename
\ No newline at end of file
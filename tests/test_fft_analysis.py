@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import json
+import os
+import tempfile
 import unittest
 import numpy as np
 from fft_analysis import FFTAnalyzer, MelSpectrogramAnalyzer
+from fft_analysis.audio import AudioLoader, STFTProcessor
+from fft_analysis._numba import NUMBA_AVAILABLE, ROCKET_FFT_AVAILABLE
 
 class TestFFTAnalyzer(unittest.TestCase):
     """FFT分析器的單元測試。"""
@@ -19,6 +24,34 @@ class TestFFTAnalyzer(unittest.TestCase):
         self.assertEqual(len(signal), 1000)
         self.assertEqual(freqs, [5, 10, 15])
     
+    def test_signal_generation_long(self):
+        """測試長信號在 Numba 與 numpy 路徑下都與 float64 參考結果一致。"""
+        import fft_analysis.fft as fft_module
+        
+        t64 = np.arange(441000) / 44100
+        expected = (np.sin(2 * np.pi * 440 * t64) + 0.5 * np.sin(2 * np.pi * 880 * t64)
+                    + 0.25 * np.sin(2 * np.pi * 1320 * t64))
+        
+        numba_available = fft_module.NUMBA_AVAILABLE
+        try:
+            for available in {numba_available, False}:
+                fft_module.NUMBA_AVAILABLE = available
+                with self.subTest(numba=available):
+                    t, signal, _ = self.analyzer.generate_signal(freq=440, duration=10,
+                                                                 sampling_rate=44100)
+                    self.assertEqual(signal.dtype, np.float32)
+                    np.testing.assert_allclose(t, t64, atol=1e-6)
+                    np.testing.assert_allclose(signal, expected, atol=1e-5)
+        finally:
+            fft_module.NUMBA_AVAILABLE = numba_available
+    
+    def test_signal_generation_empty(self):
+        """測試持續時間為0時返回空數組。"""
+        t, signal, target_freqs = self.analyzer.generate_signal(duration=0)
+        self.assertEqual(len(t), 0)
+        self.assertEqual(len(signal), 0)
+        self.assertEqual(target_freqs, [5, 10, 15])
+    
     def test_fft_ifft(self):
         """測試FFT和iFFT功能。"""
         # 生成簡單的測試信號
@@ -36,9 +69,143 @@ class TestFFTAnalyzer(unittest.TestCase):
         reconstructed = self.analyzer.perform_ifft(fft_result)
         
         # 檢查重構誤差
-        error = np.mean(np.abs(original_signal - reconstructed))
+        error = FFTAnalyzer._mae(original_signal, reconstructed)
         self.assertLess(error, 1e-10)
 
+    def test_fft_spectrum(self):
+        """測試FFT只返回非負頻率且幅值正確。"""
+        t, signal, target_freqs = self.analyzer.generate_signal()
+        freq, magnitude = self.analyzer.perform_fft(signal, 1000)
+        
+        self.assertEqual(len(freq), len(signal) // 2 + 1)
+        self.assertEqual(freq[0], 0)
+        np.testing.assert_allclose(magnitude[target_freqs], [1.0, 0.5, 0.25], atol=1e-5)
+    
+    def test_fft_zero_padding(self):
+        """測試非快速長度的信號補零至快速長度，且幅值仍以原始長度正規化。"""
+        import scipy.fft
+        
+        n = 1009  # 質數長度
+        signal = np.ones(n)
+        freq, magnitude = self.analyzer.perform_fft(signal, 1000)
+        
+        nfast = scipy.fft.next_fast_len(n, real=True)
+        self.assertGreater(nfast, n)
+        self.assertEqual(len(freq), nfast // 2 + 1)
+        np.testing.assert_allclose(freq[1], 1000 / nfast)
+        self.assertAlmostEqual(float(magnitude[0]), 1.0, places=5)
+    
+    def test_fft_batch(self):
+        """測試批次FFT的每一列與逐一呼叫 perform_fft 的結果一致。"""
+        signals = np.stack([self.analyzer.generate_signal(freq=f)[1] for f in (5, 10, 20)])
+        freq, magnitudes = self.analyzer.perform_fft_batch(signals, 1000)
+        
+        self.assertEqual(magnitudes.shape, (3, len(freq)))
+        for signal, magnitude in zip(signals, magnitudes):
+            expected_freq, expected = self.analyzer.perform_fft(signal, 1000)
+            np.testing.assert_array_equal(freq, expected_freq)
+            np.testing.assert_allclose(magnitude, expected, atol=1e-6)
+        
+        with self.assertRaises(ValueError):
+            self.analyzer.perform_fft_batch(signals[0], 1000)
+    
+    def test_fft_thread_safety(self):
+        """測試多個執行緒同時以各自的分析器執行FFT時結果互不干擾。"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        rng = np.random.default_rng(0)
+        signals = [rng.standard_normal(1 << 16) for _ in range(8)]
+        expected = [np.abs(np.fft.rfft(s)) * (2.0 / len(s)) for s in signals]
+        
+        def run(i):
+            analyzer = FFTAnalyzer()
+            return [analyzer.perform_fft(signals[i], 1000)[1][1:-1] for _ in range(20)]
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(run, range(8)))
+        for magnitudes, reference in zip(results, expected):
+            for magnitude in magnitudes:
+                np.testing.assert_allclose(magnitude, reference[1:-1], atol=1e-3)
+    
+    def test_fft_strided_input(self):
+        """測試非連續的切片輸入與連續輸入得到相同結果。"""
+        t, signal, target_freqs = self.analyzer.generate_signal(duration=2)
+        strided = signal[::2]
+        
+        freq, magnitude = self.analyzer.perform_fft(strided, 500)
+        expected_freq, expected = self.analyzer.perform_fft(strided.copy(), 500)
+        np.testing.assert_array_equal(freq, expected_freq)
+        np.testing.assert_allclose(magnitude, expected, atol=1e-6)
+    
+    def test_mae(self):
+        """測試平均絕對誤差與 numpy 參考結果一致。"""
+        rng = np.random.default_rng(0)
+        a = rng.standard_normal(1001)
+        b = rng.standard_normal(1001)
+        self.assertAlmostEqual(FFTAnalyzer._mae(a, b), np.mean(np.abs(a - b)), places=10)
+        self.assertEqual(FFTAnalyzer._mae(a, a), 0.0)
+        self.assertEqual(FFTAnalyzer._mae(np.array([0], np.uint8), np.array([1], np.uint8)), 1.0)
+        with self.assertRaises(ValueError):
+            FFTAnalyzer._mae(np.ones(10), np.ones(5))
+        with self.assertRaises(ValueError):
+            FFTAnalyzer._mae(np.array([]), np.array([]))
+    
+    @unittest.skipUnless(NUMBA_AVAILABLE, "需要 numba")
+    def test_fft_iter(self):
+        """測試迭代式基數2 FFT 與 numpy.fft.fft 結果一致。"""
+        from fft_analysis.fft import _fft_iter, _twiddle_table
+        
+        for n in (1, 2, 8, 1024):
+            x = np.random.default_rng(n).standard_normal(n)
+            np.testing.assert_allclose(_fft_iter(x, _twiddle_table(n)), np.fft.fft(x), atol=1e-9)
+        
+        x = np.random.default_rng(0).standard_normal(1000)
+        if ROCKET_FFT_AVAILABLE:
+            np.testing.assert_allclose(FFTAnalyzer._fft_numba(x), np.fft.fft(x), atol=1e-9)
+        else:
+            with self.assertRaises(ValueError):
+                FFTAnalyzer._fft_numba(x)
+    
+    def test_save_data(self):
+        """測試實驗數據以 NPZ 保存，參數另存於 JSON 檔案。"""
+        t, signal, target_freqs = self.analyzer.generate_signal()
+        freq, magnitude = self.analyzer.perform_fft(signal, 1000)
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cwd = os.getcwd()
+            os.chdir(tmpdir)
+            try:
+                data_path = self.analyzer.save_data(t, signal, signal, freq, magnitude, target_freqs)
+                self.assertTrue(data_path.endswith('.npz'))
+                
+                with np.load(data_path) as data:
+                    np.testing.assert_array_equal(data['original_signal'], signal)
+                    np.testing.assert_array_equal(data['fft_magnitude'], magnitude)
+                
+                with open(data_path.replace('.npz', '.json')) as f:
+                    metadata = json.load(f)
+                self.assertEqual(metadata['target_frequencies'], target_freqs)
+                self.assertEqual(metadata['data_file'], data_path)
+            finally:
+                os.chdir(cwd)
+    
+    def test_update_report_appends(self):
+        """測試報告以附加模式寫入，標題只寫入一次。"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cwd = os.getcwd()
+            os.chdir(tmpdir)
+            try:
+                self.analyzer.update_report('a.png', 'a.npz', 0.1)
+                self.analyzer.update_report('b.png', 'b.npz', 0.2)
+                
+                with open('REPORT.md', encoding='utf-8') as f:
+                    content = f.read()
+                self.assertTrue(content.startswith("# FFT 實驗報告\n\n"))
+                self.assertEqual(content.count("# FFT 實驗報告"), 1)
+                self.assertLess(content.index('a.png'), content.index('b.png'))
+            finally:
+                os.chdir(cwd)
+
 class TestMelSpectrogramAnalyzer(unittest.TestCase):
     """梅爾頻譜分析器的單元測試。"""
     
@@ -65,6 +232,228 @@ class TestMelSpectrogramAnalyzer(unittest.TestCase):
         # 檢查輸出形狀
         self.assertEqual(mel_spec.shape[0], 128)  # n_mels
         self.assertTrue(mel_spec.shape[1] > 0)    # 時間幀數
+    
+    def test_power_to_db(self):
+        """測試分貝轉換與 librosa.power_to_db(ref=np.max) 結果一致。"""
+        import librosa
+        from fft_analysis.mel_spectrogram import _power_to_db
+        
+        S = np.random.default_rng(0).random((128, 40)) ** 8
+        S[0, 0] = 0
+        np.testing.assert_allclose(_power_to_db(S), librosa.power_to_db(S, ref=np.max),
+                                   atol=1e-6)
+        np.testing.assert_allclose(_power_to_db(S.astype(np.float32)),
+                                   librosa.power_to_db(S.astype(np.float32), ref=np.max),
+                                   atol=1e-3)
+
+class TestSTFTProcessor(unittest.TestCase):
+    """STFT 處理器的單元測試。"""
+    
+    def setUp(self):
+        """測試前的準備工作。"""
+        self.processor = STFTProcessor(window_size=256, hop_length=64, experiment_id=999,
+                                       dtype=np.float64)
+        t = np.linspace(0, 1, 4000, endpoint=False)
+        self.signal = np.sin(2 * np.pi * 50 * t) + 0.5 * np.sin(2 * np.pi * 120 * t)
+    
+    def test_stft_matches_framewise_fft(self):
+        """測試批次 STFT 與逐幀 FFT 結果一致。"""
+        stft_matrix = self.processor.stft(self.signal)
+        num_frames = 1 + (len(self.signal) - 256) // 64
+        self.assertEqual(stft_matrix.shape, (256 // 2 + 1, num_frames))
+        
+        for i in (0, num_frames // 2, num_frames - 1):
+            frame = self.signal[i * 64:i * 64 + 256] * self.processor.window
+            np.testing.assert_allclose(stft_matrix[:, i], np.fft.rfft(frame), atol=1e-10)
+    
+    def test_stft_thread_safety(self):
+        """測試多個執行緒共用同一個處理器時 STFT 結果互不干擾。"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        rng = np.random.default_rng(0)
+        signals = [rng.standard_normal(20000) for _ in range(8)]
+        expected = [self.processor.stft(s) for s in signals]
+        
+        def run(i):
+            return [self.processor.stft(signals[i]) for _ in range(10)]
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(run, range(8)))
+        for stft_matrices, reference in zip(results, expected):
+            for stft_matrix in stft_matrices:
+                np.testing.assert_allclose(stft_matrix, reference, atol=1e-10)
+    
+    def test_istft_matches_overlap_add(self):
+        """測試 iSTFT 與逐幀重疊相加的結果一致。"""
+        stft_matrix = self.processor.stft(self.signal)
+        reconstructed = self.processor.istft(stft_matrix)
+        
+        window = self.processor.window
+        expected = np.zeros(len(reconstructed))
+        window_sum = np.zeros(len(reconstructed))
+        for i in range(stft_matrix.shape[1]):
+            frame = np.fft.irfft(stft_matrix[:, i], n=256) * window
+            expected[i * 64:i * 64 + 256] += frame
+            window_sum[i * 64:i * 64 + 256] += window
+        window_sum[window_sum < 1e-6] = 1
+        
+        np.testing.assert_allclose(reconstructed, expected / window_sum, atol=1e-10)
+    
+    def test_norm_matches_direct_overlap_add(self):
+        """測試由模板組成的重疊相加權重與逐幀直接相加一致。"""
+        for window_size, hop_length in ((256, 64), (100, 30), (64, 100)):
+            processor = STFTProcessor(window_size=window_size, hop_length=hop_length,
+                                      dtype=np.float64)
+            for num_frames in (1, 2, 3, 4, 50):
+                with self.subTest(window_size=window_size, hop_length=hop_length,
+                                  num_frames=num_frames):
+                    expected = np.zeros((num_frames - 1) * hop_length + window_size)
+                    for i in range(num_frames):
+                        expected[i * hop_length:i * hop_length + window_size] += processor.window
+                    expected[expected < 1e-6] = 1
+                    
+                    np.testing.assert_allclose(processor._get_norm(num_frames), expected,
+                                               atol=1e-12)
+    
+    def test_norm_cache_bounded(self):
+        """測試重疊相加權重的快取數量有上限。"""
+        from fft_analysis.audio.stft import NORM_CACHE_SIZE
+        
+        for num_frames in range(1, 3 * NORM_CACHE_SIZE):
+            self.processor._get_norm(num_frames)
+        self.assertEqual(len(self.processor._norm_cache), NORM_CACHE_SIZE)
+    
+    def test_pickle_round_trip(self):
+        """測試處理器可被 pickle，且還原後的 STFT 結果一致。"""
+        import pickle
+        
+        stft_matrix = self.processor.stft(self.signal)
+        self.processor.istft(stft_matrix)
+        restored = pickle.loads(pickle.dumps(self.processor))
+        
+        np.testing.assert_array_equal(restored.stft(self.signal), stft_matrix)
+        np.testing.assert_array_equal(restored.istft(stft_matrix),
+                                      self.processor.istft(stft_matrix))
+    
+    def test_rejects_zero_workers(self):
+        """測試所有後端都拒絕 workers=0。"""
+        for backend in ('scipy', 'numpy'):
+            with self.assertRaises(ValueError):
+                STFTProcessor(window_size=256, hop_length=64, backend=backend, workers=0)
+    
+    def test_numpy_backend(self):
+        """測試 NumPy 後端與預設 scipy 後端結果一致。"""
+        numpy_processor = STFTProcessor(window_size=256, hop_length=64, dtype=np.float64,
+                                        backend='numpy')
+        
+        stft_matrix = self.processor.stft(self.signal)
+        np.testing.assert_allclose(numpy_processor.stft(self.signal), stft_matrix, atol=1e-10)
+        np.testing.assert_allclose(numpy_processor.istft(stft_matrix),
+                                   self.processor.istft(stft_matrix), atol=1e-10)
+    
+    def test_stft_streaming(self):
+        """測試逐塊 STFT 的拼接結果與一次計算一致。"""
+        stft_matrix = self.processor.stft(self.signal)
+        blocks = list(self.processor.stft_streaming(self.signal, block_frames=7))
+        
+        self.assertEqual([start for start, _ in blocks], list(range(0, stft_matrix.shape[1], 7)))
+        np.testing.assert_allclose(np.hstack([block for _, block in blocks]), stft_matrix)
+    
+    def test_stft_to_memmap(self):
+        """測試逐塊寫入記憶體映射檔案的 STFT 與一次計算一致。"""
+        stft_matrix = self.processor.stft(self.signal)
+        self.assertNotEqual(stft_matrix.shape[1] % 16, 0)
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, 'stft.npy')
+            memmap = self.processor.stft_to_memmap(self.signal, file_path, block_frames=16)
+            del memmap
+            
+            loaded = np.load(file_path)
+            self.assertEqual(loaded.shape, stft_matrix.shape)
+            np.testing.assert_allclose(loaded, stft_matrix, atol=1e-12)
+    
+    def test_single_precision(self):
+        """測試預設的單精度計算。"""
+        processor = STFTProcessor(window_size=256, hop_length=64)
+        stft_matrix = processor.stft(self.signal)
+        self.assertEqual(stft_matrix.dtype, np.complex64)
+        np.testing.assert_allclose(stft_matrix, self.processor.stft(self.signal), atol=1e-4)
+        
+        reconstructed = processor.istft(stft_matrix)
+        self.assertEqual(reconstructed.dtype, np.float32)
+    
+    def test_istft_rejects_full_spectrum(self):
+        """測試 iSTFT 拒絕完整（雙邊）頻譜的輸入。"""
+        full_spectrum = np.zeros((256, 10), dtype=np.complex128)
+        with self.assertRaises(ValueError):
+            self.processor.istft(full_spectrum)
+    
+    @unittest.skipUnless(ROCKET_FFT_AVAILABLE, "需要 numba 與 rocket-fft")
+    def test_numba_backend(self):
+        """測試 Numba 後端與 NumPy 後端結果一致。"""
+        numba_processor = STFTProcessor(window_size=256, hop_length=64, dtype=np.float64,
+                                        backend='numba')
+        
+        stft_matrix = self.processor.stft(self.signal)
+        np.testing.assert_allclose(numba_processor.stft(self.signal), stft_matrix, atol=1e-10)
+        np.testing.assert_allclose(numba_processor.istft(stft_matrix),
+                                   self.processor.istft(stft_matrix), atol=1e-10)
+
+class TestSpectrogramPlotter(unittest.TestCase):
+    def test_init(self):
+        """測試繪製器可由 visualization 套件匯入並建立。"""
+        from fft_analysis.visualization import SpectrogramPlotter
+        
+        plotter = SpectrogramPlotter(experiment_id=3)
+        self.assertEqual(plotter.experiment_id, 3)
+        self.assertIsNone(plotter._date)  # 日期在第一次存取時才取得
+        self.assertEqual(len(plotter.date), 8)
+    
+    def test_mag_db(self):
+        """測試分貝轉換與 numpy 參考結果一致，且零值被限制在 -200 dB。"""
+        from fft_analysis.visualization.spectrogram import _mag_db
+        
+        rng = np.random.default_rng(0)
+        stft_matrix = rng.standard_normal((129, 50)) + 1j * rng.standard_normal((129, 50))
+        stft_matrix[0, 0] = 0
+        
+        magnitude_db = _mag_db(stft_matrix)
+        expected = 20 * np.log10(np.maximum(np.abs(stft_matrix), 1e-10))
+        self.assertEqual(magnitude_db.dtype, np.float32)
+        np.testing.assert_allclose(magnitude_db, expected, rtol=1e-5, atol=1e-4)
+        self.assertAlmostEqual(float(magnitude_db[0, 0]), -200.0, places=3)
+
+class TestAudioLoader(unittest.TestCase):
+    """音訊讀寫的單元測試。"""
+    
+    def setUp(self):
+        """測試前的準備工作。"""
+        self.loader = AudioLoader(chunk_size=1000)
+        t = np.arange(5000) / 8000
+        self.audio = 2 * np.sin(2 * np.pi * 440 * t)
+    
+    def test_save_audio_chunked(self):
+        """測試分塊寫入的音訊經裁剪後可正確讀回，且不修改輸入數組。"""
+        original = self.audio.copy()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, 'chunked.wav')
+            self.loader.save_audio(file_path, self.audio, 8000)
+            audio_data, sample_rate = self.loader.load_audio(file_path)
+        
+        self.assertEqual(sample_rate, 8000)
+        np.testing.assert_array_equal(self.audio, original)
+        np.testing.assert_allclose(audio_data, np.clip(original, -1, 1), atol=1e-4)
+    
+    def test_save_audio_inplace(self):
+        """測試 inplace=True 時直接在輸入數組上裁剪。"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, 'inplace.wav')
+            self.loader.save_audio(file_path, self.audio, 8000, inplace=True)
+            audio_data, _ = self.loader.load_audio(file_path)
+        
+        self.assertLessEqual(np.max(np.abs(self.audio)), 1)
+        np.testing.assert_allclose(audio_data, self.audio, atol=1e-4)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file